@@ -2,31 +2,283 @@ from typing import *
 
 import imaplib
 import email
+import email.feedparser
 import os
+import re
+import sys
 import time
 import socket
+import sqlite3
+import asyncio
+import json
+import threading
 
+from functools import cached_property, lru_cache
+from contextlib import contextmanager
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, timezone, timedelta
 from email.policy import default
-from email.utils import parsedate_to_datetime
+from email.parser import BytesParser
+from email.utils import parsedate_tz
+from email.header import decode_header, make_header
 
+try:
+	from fast_mail_parser import parse_email
+except ImportError:
+	parse_email = None
 
-class Message:
-	def __init__(self, raw_email: bytes, mailbox: str = None):
-		self.msg = email.message_from_bytes(raw_email, policy=default)
+try:
+	import aioimaplib
+except ImportError:
+	aioimaplib = None
+
+try:
+	import orjson
+except ImportError:
+	orjson = None
+
+
+def _dump_json_bytes(data, indent: int = None) -> bytes:
+	if orjson is not None:
+		return orjson.dumps(data, option=orjson.OPT_INDENT_2 if indent else 0)
+	return json.dumps(data, indent=indent).encode()
+
+DEFAULT_FETCH_PARTS = '(BODY.PEEK[HEADER] BODY.PEEK[TEXT])'
+FULL_FETCH_PARTS = '(RFC822)'
+
+if sys.version_info < (3, 13):
+	# email.feedparser recompiles the multipart boundary regex for every parsed
+	# message, so route its re.compile calls through a shared cache
+	class _CachedRe:
+		compile = staticmethod(lru_cache(maxsize=128)(re.compile))
+
+		def __getattr__(self, name):
+			return getattr(re, name)
+
+	email.feedparser.re = _CachedRe()
+
+
+@lru_cache(maxsize=4096)
+def _parse_date(value: str) -> Optional[datetime]:
+	if not value:
+		return None
+
+	parsed = parsedate_tz(value)
+	if parsed is None:
+		return None
+
+	return datetime(*parsed[:6], tzinfo=timezone(timedelta(seconds=parsed[9] or 0)))
+
+
+_UID_RE = re.compile(rb'UID (\d+)')
+
+def _join_raw_messages(list_data: list, chunks_per_message: int) -> List[tuple]:
+	raws = []
+	pending = []
+	uid = None
+
+	for data in list_data:
+		if isinstance(data, tuple) and isinstance(data[1], bytes):
+			if not pending:
+				found = _UID_RE.search(data[0])
+				uid = int(found.group(1)) if found else None
+			pending.append(data[1])
+			if len(pending) == chunks_per_message:
+				raws.append(( uid, b''.join(pending) ))
+				pending = []
+
+	return raws
+
+
+SUMMARY_FETCH_PARTS = '(UID ENVELOPE RFC822.SIZE INTERNALDATE)'
+
+MAX_HEADER_LINE = 16384
+_SEMI_RUN_RE = re.compile(rb';{128,}')
+_MBOX_QUOTED_RE = re.compile(rb'"((?:[^"\\]|\\.)*)"\s*$')
+_MBOX_ATOM_RE = re.compile(rb'([^\s"]+)\s*$')
+_MBOX_ESCAPE_RE = re.compile(rb'\\(.)')
+
+
+def _parse_list_line(line: bytes) -> Optional[str]:
+	found = _MBOX_QUOTED_RE.search(line)
+	if found:
+		return _MBOX_ESCAPE_RE.sub(rb'\1', found.group(1)).decode()
+
+	found = _MBOX_ATOM_RE.search(line)
+	return found.group(1).decode() if found else None
+_BYTES_PARSER = BytesParser(policy=default)
+
+
+def _defuse_headers(raw_email: bytes) -> bytes:
+	# hostile headers (>16KB lines or long ';' runs) freeze the stdlib RFC 2047
+	# parser for tens of seconds, so trim them before parsing
+	head, sep, body = raw_email.partition(b'\r\n\r\n')
+	if not sep:
+		head, sep, body = raw_email.partition(b'\n\n')
 
-		self.id = self.msg['Message-ID']
-		self.From = self.msg['From']
-		self.To = self.msg['To']
-		self.subject = self.msg['Subject']
-		self.date_sent = parsedate_to_datetime(self.msg['Date'])
-		self.date_received = parsedate_to_datetime(self.msg['Received'].split('; ')[-1].split(';')[-1])
-		self.body = self._get_body(self.msg)
-		self.attachments = self._get_attachments(self.msg)
+	lines = head.split(b'\n')
+	changed = False
 
+	for i, line in enumerate(lines):
+		if len(line) > MAX_HEADER_LINE:
+			lines[i] = line[:MAX_HEADER_LINE]
+			changed = True
+		if _SEMI_RUN_RE.search(lines[i]):
+			lines[i] = _SEMI_RUN_RE.sub(b';', lines[i])
+			changed = True
+
+	if not changed:
+		return raw_email
+
+	return b'\n'.join(lines) + sep + body
+
+
+def _flatten_fetch_entry(parts: list) -> Tuple[bytes, List[bytes]]:
+	flat = b''
+	literals = []
+
+	for part in parts:
+		if isinstance(part, tuple):
+			flat += re.sub(rb'\{\d+\}$', b'', part[0]) + b'\x00%d\x00' % len(literals)
+			literals.append(part[1])
+		else:
+			flat += part
+
+	return flat, literals
+
+
+def _iter_fetch_entries(list_data: list) -> Iterator[Tuple[bytes, List[bytes]]]:
+	pending = []
+
+	for part in list_data:
+		if isinstance(part, tuple):
+			pending.append(part)
+		elif pending:
+			pending.append(part)
+			yield _flatten_fetch_entry(pending)
+			pending = []
+		elif part and part != b')':
+			yield _flatten_fetch_entry([part])
+
+	if pending:
+		yield _flatten_fetch_entry(pending)
+
+
+def _parse_imap_list(data: bytes, literals: List[bytes], pos: int = 0) -> Tuple[list, int]:
+	items = []
+
+	while pos < len(data):
+		c = data[pos:pos + 1]
+
+		if c == b'(':
+			sub, pos = _parse_imap_list(data, literals, pos + 1)
+			items.append(sub)
+		elif c == b')':
+			return items, pos + 1
+		elif c == b'"':
+			end = pos + 1
+			value = b''
+			while end < len(data) and data[end:end + 1] != b'"':
+				if data[end:end + 1] == b'\\':
+					end += 1
+				value += data[end:end + 1]
+				end += 1
+			items.append(value)
+			pos = end + 1
+		elif c == b'\x00':
+			end = data.index(b'\x00', pos + 1)
+			items.append(literals[int(data[pos + 1:end])])
+			pos = end + 1
+		elif c in b' \r\n':
+			pos += 1
+		else:
+			end = pos
+			while end < len(data) and data[end:end + 1] not in (b' ', b'(', b')', b'"', b'\x00'):
+				end += 1
+			atom = data[pos:end]
+			items.append(None if atom.upper() == b'NIL' else atom)
+			pos = end
+
+	return items, pos
+
+
+def _fetch_fields(flat: bytes, literals: List[bytes]) -> dict:
+	parsed, _ = _parse_imap_list(flat, literals)
+
+	for item in parsed:
+		if isinstance(item, list):
+			fields = {}
+			it = iter(item)
+			for key in it:
+				if isinstance(key, (bytes, bytearray)):
+					fields[bytes(key).upper()] = next(it, None)
+			return fields
+
+	return {}
+
+
+class Message:
+	def __init__(self, raw_email: bytes, mailbox: str = None):
+		self.raw_email = raw_email
 		self.mailbox_name = str(mailbox) if mailbox else None
 
 		self.keys = ['id', 'From', 'To', 'subject', 'date_sent', 'date_received', 'attachments', 'body']
 
+	@cached_property
+	def msg(self) -> 'email.message.Message':
+		return _BYTES_PARSER.parsebytes(_defuse_headers(self.raw_email))
+
+	@cached_property
+	def _fast(self):
+		if parse_email is None:
+			return None
+
+		try:
+			return parse_email(self.raw_email)
+		except Exception:
+			return None
+
+	def _header(self, name: str) -> Optional[str]:
+		if self._fast is not None and name in self._fast.headers:
+			return self._fast.headers[name]
+		return self.msg[name]
+
+	@cached_property
+	def id(self) -> Optional[str]:
+		return self._header('Message-ID')
+
+	@cached_property
+	def From(self) -> Optional[str]:
+		return self._header('From')
+
+	@cached_property
+	def To(self) -> Optional[str]:
+		return self._header('To')
+
+	@cached_property
+	def subject(self) -> Optional[str]:
+		return self._fast.subject if self._fast is not None else self.msg['Subject']
+
+	@cached_property
+	def date_sent(self) -> Optional[datetime]:
+		return _parse_date(self._header('Date'))
+
+	@cached_property
+	def date_received(self) -> Optional[datetime]:
+		return _parse_date(self._header('Received').rpartition(';')[2].strip())
+
+	@cached_property
+	def body(self) -> Optional[str]:
+		if self._fast is not None:
+			return self._fast.text_plain[0] if self._fast.text_plain else None
+		return self._parts[0]
+
+	@cached_property
+	def attachments(self) -> List[tuple]:
+		if self._fast is not None:
+			return [ (a.filename, a.content) for a in self._fast.attachments ]
+		return self._parts[1]
+
 	@property
 	def mailbox(self) -> 'MailBox':
 		return self.get_mailbox()
@@ -67,40 +319,63 @@ Subject: {self.subject}
 		elif type == 'long':
 			return self.format_long()
 
-	def _get_body(self, msg: str) -> Optional[str]:
-		if msg.is_multipart():
-			for part in msg.iter_parts():
-				if part.get_content_type() == "text/plain":
-					return part.get_payload(decode=True).decode('utf-8')
-		else:
-			return msg.get_payload(decode=True).decode('utf-8')
+	@cached_property
+	def _parts(self) -> Tuple[Optional[str], List[tuple]]:
+		msg = self.msg
+
+		if not msg.is_multipart():
+			return msg.get_payload(decode=True).decode('utf-8'), []
 
-	def _get_attachments(self, msg: 'email.message.Message') -> List[str]:
+		body = None
 		attachments = []
 
-		if msg.is_multipart():
-			for part in msg.iter_parts():
-				filename = part.get_filename()
-				if filename:
-					attachments.append([ filename, part.get_payload(decode=True) ])
+		for part in msg.walk():
+			if part.is_multipart():
+				continue
+
+			filename = part.get_filename()
+			if filename:
+				attachments.append(( filename, part ))
+			elif body is None and part.get_content_type() == 'text/plain':
+				body = part.get_payload(decode=True).decode('utf-8')
 
-		return attachments
+		return body, attachments
+
+	@staticmethod
+	def _attachment_bytes(payload) -> bytes:
+		if isinstance(payload, (bytes, bytearray)):
+			return bytes(payload)
+		return payload.get_payload(decode=True)
+
+	def iter_attachments(self) -> Iterator[Tuple[str, memoryview]]:
+		for filename, payload in self.attachments:
+			yield filename, memoryview(self._attachment_bytes(payload))
 
 	def save_attachments(self, directory: str, name_format: str = '{short_id}_{name}', format_kwargs: dict = {}) -> List[str]:
 		saved_files = []
 
-		for filename, file_data in self.attachments:
+		for filename, payload in self.attachments:
 			new_file_name = name_format.format(short_id=self.id.split("@")[0][1:], name=filename, **format_kwargs)
 			file_path = os.path.join(directory, new_file_name)
-			open(file_path, 'wb').write(file_data)
+			with open(file_path, 'wb') as f:
+				f.write(memoryview(self._attachment_bytes(payload)))
 			saved_files.append(new_file_name)
 
 		return saved_files
 
-	def serialize(self) -> List[dict]:
-		return { key:str(self[key]) for key in self.keys }
+	def serialize(self) -> dict:
+		data = {}
+		for key in self.keys:
+			if key == 'attachments':
+				data[key] = [ filename for filename, payload in self.attachments ]
+				continue
+			value = self[key]
+			data[key] = value if isinstance(value, str) else str(value)
+		return data
 	def json(self, indent: int = None) -> str:
-		return json.dumps(self.serialize()) if not indent else json.dumps(self.serialize(), indent=indent)
+		return _dump_json_bytes(self.serialize(), indent=indent).decode()
+	def jsonb(self, indent: int = None) -> bytes:
+		return _dump_json_bytes(self.serialize(), indent=indent)
 
 
 	def __getitem__(self, i: str) -> str:
@@ -111,7 +386,114 @@ Subject: {self.subject}
 	def __str__(self):
 		return self.format_short()
 	def __repr__(self):
-		return f'{self.__class__.__name__}({self.mailbox_name}, {self.From} -> {self.To}, "{self.subject}", body {len(self.body)} symbols, {len(self.attachments)} attachments)'
+		body = self.__dict__.get('body')
+		attachments = self.__dict__.get('attachments')
+		body_info = f'body {len(body)} symbols' if body is not None else 'body is not loaded'
+		attachments_info = f'{len(attachments)} attachments' if attachments is not None else 'attachments are not loaded'
+		return f'{self.__class__.__name__}({self.mailbox_name}, {self.From} -> {self.To}, "{self.subject}", {body_info}, {attachments_info})'
+
+class MessageSummary:
+	def __init__(self, mailer: 'Mailer', mailbox_name: str, uid=None, envelope: list = None, size=None, internal_date=None):
+		self.mailer = mailer
+		self.mailbox_name = str(mailbox_name) if mailbox_name else None
+		self.uid = int(uid) if uid is not None else None
+		self.size = int(size) if size is not None else None
+
+		envelope = list(envelope) if envelope else []
+		envelope += [None] * (10 - len(envelope))
+		date, subject, from_, sender, reply_to, to, cc, bcc, in_reply_to, message_id = envelope[:10]
+
+		self.id = self._decode(message_id)
+		self.subject = self._decode_header(subject)
+		self.From = self._format_addresses(from_)
+		self.To = self._format_addresses(to)
+		self.date_sent = _parse_date(self._decode(date))
+		self.date_received = self._parse_internal_date(internal_date)
+
+		self.keys = ['id', 'From', 'To', 'subject', 'date_sent', 'date_received', 'size']
+
+	@staticmethod
+	def _decode(value) -> Optional[str]:
+		if value is None:
+			return None
+		return bytes(value).decode('utf-8', 'replace')
+
+	@classmethod
+	def _decode_header(cls, value) -> Optional[str]:
+		value = cls._decode(value)
+		if value and '=?' in value:
+			try:
+				return str(make_header(decode_header(value)))
+			except Exception:
+				pass
+		return value
+
+	@classmethod
+	def _format_addresses(cls, addresses) -> Optional[str]:
+		if not addresses:
+			return None
+
+		formatted = []
+		for address in addresses:
+			if not isinstance(address, list) or len(address) < 4:
+				continue
+
+			name, adl, mailbox, host = address[:4]
+			email_addr = f'{cls._decode(mailbox)}@{cls._decode(host)}' if mailbox and host else None
+			name = cls._decode_header(name)
+
+			if name and email_addr:
+				formatted.append(f'{name} <{email_addr}>')
+			elif email_addr:
+				formatted.append(email_addr)
+
+		return ', '.join(formatted) if formatted else None
+
+	@classmethod
+	def _parse_internal_date(cls, value) -> Optional[datetime]:
+		if value is None:
+			return None
+
+		try:
+			return datetime.strptime(cls._decode(value), '%d-%b-%Y %H:%M:%S %z')
+		except ValueError:
+			return None
+
+	@cached_property
+	def message(self) -> Optional['Message']:
+		return self.get_message()
+	def get_message(self, fetch_attachments: bool = True) -> Optional['Message']:
+		for msg in self.mailer.fetch_bulk([self.uid], self.mailbox_name, fetch_attachments=fetch_attachments):
+			return msg
+
+	@property
+	def body(self) -> Optional[str]:
+		return self.message.body
+	@property
+	def attachments(self) -> List[tuple]:
+		return self.message.attachments
+
+	def serialize(self) -> dict:
+		data = {}
+		for key in self.keys:
+			value = self[key]
+			data[key] = value if isinstance(value, str) else str(value)
+		return data
+	def json(self, indent: int = None) -> str:
+		return _dump_json_bytes(self.serialize(), indent=indent).decode()
+	def jsonb(self, indent: int = None) -> bytes:
+		return _dump_json_bytes(self.serialize(), indent=indent)
+
+	def __getitem__(self, i: str) -> str:
+		if i in self.keys:
+			return getattr(self, i)
+		else:
+			raise KeyError(f'{self.__class__.__name__} has only {len(self.keys)} allowed keys: {self.keys}')
+	def __str__(self):
+		return f'{self.From} -> {self.To}: {self.subject}'
+	def __repr__(self):
+		return f'{self.__class__.__name__}({self.mailbox_name}, {self.From} -> {self.To}, "{self.subject}", {self.size} bytes)'
+
 
 class MailBox:
 	def __init__(self, mailer: 'Mailer', name: str):
@@ -125,28 +507,38 @@ class MailBox:
 			return self.mailer.slice_messages(msg_id.start, msg_id.stop, self.name, step=msg_id.step if msg_id.step != None else 1)
 
 	@property
-	def messages(self) -> List['Message']:
+	def messages(self) -> List['MessageSummary']:
 		return self.get_messages()
-	def get_messages(self) -> List['Message']:
-		return self.mailer.get_messages(self.name)
+	def get_messages(self) -> List['MessageSummary']:
+		return list(self.mailer.fetch_summaries(self.name))
+	def get_full_messages(self) -> List['Message']:
+		return list(self.mailer.fetch_bulk(self.mailer.get_messages(self.name), self.name))
+	def iter_messages(self, start: int = 1, end: int = 0, step: int = 1, batch_size: int = 20,
+					  parts: str = DEFAULT_FETCH_PARTS, fetch_attachments: bool = False) -> Iterator['Message']:
+		return self.mailer.iter_messages(self.name, start, end, step=step, batch_size=batch_size, parts=parts, fetch_attachments=fetch_attachments)
 
 	def serialize(self) -> List[dict]:
 		return [ msg.serialize() for msg in self.messages ]
 	def json(self, indent: int = None) -> str:
-		return json.dumps(self.serialize()) if not indent else json.dumps(self.serialize(), indent=indent)
+		return _dump_json_bytes(self.serialize(), indent=indent).decode()
+	def jsonb(self, indent: int = None) -> bytes:
+		return _dump_json_bytes(self.serialize(), indent=indent)
 
 	def __list__(self):
 		return self.messages
+	def __iter__(self) -> Iterator['MessageSummary']:
+		return self.mailer.fetch_summaries(self.name)
 	def __len__(self):
-		return len(self.messages)
+		uids = self.mailer.get_messages(self.name)
+		return len(uids) if isinstance(uids, list) else 0
 	def __str__(self):
-		return f'{self.__class__.__name__}_{self.name}({len(self.messages)} messages)'
+		return f'{self.__class__.__name__}_{self.name}({len(self)} messages)'
 	def __repr__(self):
 		return f'{self.__class__.__name__}({self.mailer}, "{self.name}")'
 
 
 class Mailer(imaplib.IMAP4_SSL):
-	def __init__(self, username: str, password: str, host: str, port: int = 993, default_box: str = 'INBOX'):
+	def __init__(self, username: str, password: str, host: str, port: int = 993, default_box: str = 'INBOX', cache_path: str = None):
 		try:
 			super().__init__(host, port)
 		except socket.gaierror:
@@ -157,103 +549,365 @@ class Mailer(imaplib.IMAP4_SSL):
 		self.default_box = str(default_box)
 		self.host = str(host)
 		self.port = int(port)
+		self.cache_path = cache_path
+
+		self._cache = None
+		self._cache_lock = threading.Lock()
+		if cache_path:
+			self._cache = sqlite3.connect(os.path.expanduser(str(cache_path)), check_same_thread=False)
+			self._cache.execute('PRAGMA journal_mode=WAL')
+			self._cache.execute(
+				'CREATE TABLE IF NOT EXISTS messages (host TEXT, mailbox TEXT, uid INTEGER, raw_email BLOB, PRIMARY KEY (host, mailbox, uid))'
+			)
+			self._cache.commit()
+
+		self._mailboxes_cache = None
+		self._mailboxes_set = None
+		self._selected = None
+		self._selected_total = 0
+		self._uids_cache = None
 
 		self.login(self.username, self.password)
 
-		if self.default_box in self.mailboxes:
-			self.select(self.default_box)
+		if self._has_mailbox(self.default_box):
+			self._select(self.default_box)
 		else:
 			raise ValueError(f'Typed invalid mailbox name as default_box kwarg: {default_box}')
 
 	@property
 	def mailboxes(self) -> List[str]:
-		return self.get_mailboxes()
+		if self._mailboxes_cache is None:
+			self._mailboxes_cache = self.get_mailboxes()
+			self._mailboxes_set = frozenset(self._mailboxes_cache)
+		return self._mailboxes_cache
+
+	def refresh_mailboxes(self) -> List[str]:
+		self._mailboxes_cache = None
+		self._mailboxes_set = None
+		return self.mailboxes
+
+	def login(self, user: str, password: str):
+		self._mailboxes_cache = None
+		self._mailboxes_set = None
+		return super().login(user, password)
+
+	def _reconnect(self) -> 'Mailer':
+		try:
+			self.shutdown()
+		except (OSError, imaplib.IMAP4.error):
+			pass
+
+		self._selected = None
+		self._uids_cache = None
+
+		imaplib.IMAP4_SSL.__init__(self, self.host, self.port)
+		self.login(self.username, self.password)
+		self._select(self.default_box)
+		return self
+
+	def _select(self, mailbox_name: str) -> int:
+		if self._selected != mailbox_name:
+			rv, data = self.select(mailbox_name)
+			if rv != 'OK':
+				raise imaplib.IMAP4.error(f'Can not select mailbox {mailbox_name}: {data}')
+			self._selected = mailbox_name
+			self._selected_total = int(data[0])
+			self._uids_cache = None
+		else:
+			# a NOOP flushes pending untagged EXISTS/EXPUNGE responses, so a
+			# long-lived connection staying in one mailbox still sees new mail
+			self.noop()
+
+			rv, data = self.response('EXISTS')
+			if data and data[-1] is not None:
+				self._selected_total = int(data[-1])
+				self._uids_cache = None
+
+			rv, data = self.response('EXPUNGE')
+			if data and data[-1] is not None:
+				self._uids_cache = None
+
+		return self._selected_total
+
+	def _cache_get(self, mailbox_name: str, uid: int) -> Optional[bytes]:
+		if self._cache is None:
+			return None
+
+		with self._cache_lock:
+			row = self._cache.execute(
+				'SELECT raw_email FROM messages WHERE host = ? AND mailbox = ? AND uid = ?',
+				(self.host, mailbox_name, int(uid))
+			).fetchone()
+		return row[0] if row else None
+
+	def _cache_put(self, mailbox_name: str, uid: int, raw_email: bytes):
+		if self._cache is None:
+			return
+
+		with self._cache_lock:
+			self._cache.execute(
+				'INSERT OR REPLACE INTO messages (host, mailbox, uid, raw_email) VALUES (?, ?, ?, ?)',
+				(self.host, mailbox_name, int(uid), raw_email)
+			)
+			self._cache.commit()
+
+	def prefetch(self, mailbox_name: str = None, batch_size: int = 100) -> int:
+		mailbox_name = str(mailbox_name) if mailbox_name else self.default_box
+
+		if self._cache is None:
+			return 0
+
+		self._select(mailbox_name)
+
+		with self._cache_lock:
+			row = self._cache.execute(
+				'SELECT MAX(uid) FROM messages WHERE host = ? AND mailbox = ?',
+				(self.host, mailbox_name)
+			).fetchone()
+		max_uid = row[0] or 0
+
+		rv, data = self.uid('SEARCH', None, f'UID {max_uid + 1}:*')
+		if rv != 'OK':
+			return 0
+
+		new_uids = [int(uid) for uid in data[0].split() if int(uid) > max_uid]
+		for _ in self.fetch_bulk(new_uids, mailbox_name, batch_size=batch_size):
+			pass
+
+		if new_uids:
+			self._uids_cache = None
+
+		return len(new_uids)
+
+	@contextmanager
+	def in_mailbox(self, mailbox_name: str):
+		previous = self._selected
+		self._select(mailbox_name)
+		try:
+			yield self
+		finally:
+			if previous and previous != mailbox_name:
+				self._select(previous)
+
+	def _has_mailbox(self, mailbox_name: str) -> bool:
+		self.mailboxes
+		return mailbox_name in self._mailboxes_set
+
 	def get_mailboxes(self) -> List[str]:
 		try:
 			rv, mailboxes = self.list()
 			if rv == 'OK':
-				return [mailbox.decode().replace('"', '').split(' | ')[-1].split(' / ')[-1] for mailbox in mailboxes]
+				return [name for name in map(_parse_list_line, mailboxes) if name]
 			else:
 				return []
 		except imaplib.IMAP4.abort:
-			return self.copy().get_mailboxes()
+			return self._reconnect().get_mailboxes()
 
 	@property
 	def messages(self) -> Union[List[int], str]:
 		try:
-			rv, data = self.search(None, 'ALL')
-			if rv == 'OK':
-				return [int(msg_id) for msg_id in data[0].split()]
-			return rv
+			if self._uids_cache is None:
+				rv, data = self.uid('SEARCH', None, 'ALL')
+				if rv != 'OK':
+					return rv
+				self._uids_cache = [int(uid) for uid in data[0].split()]
+			return self._uids_cache
 		except imaplib.IMAP4.abort:
-			return self.copy().get_messages(mailbox_name)
+			return self._reconnect().messages
 
 	def get_messages(self, mailbox_name: str) -> List[int]:
 		try:
-			if mailbox_name in self.mailboxes:
-				self.select(mailbox_name)
-				msgs = self.messages
-				self.select(self.default_box)
-				return msgs
+			if self._has_mailbox(mailbox_name):
+				self._select(mailbox_name)
+				return self.messages
 			else:
 				raise ValueError(
 f'{self.__class__.__name__}.messages method takes a string mailbox name, that exists in list from {self.__class__.__name__}.get_mailboxes() method'
 				)
 		except imaplib.IMAP4.abort:
-			return self.copy().get_messages(mailbox_name)
+			return self._reconnect().get_messages(mailbox_name)
+
+	def fetch_bulk(self, ids: List[int], mailbox_name: str, batch_size: int = 100,
+				   parts: str = DEFAULT_FETCH_PARTS, fetch_attachments: bool = False) -> Iterator['Message']:
+		try:
+			if self._has_mailbox(mailbox_name):
+				self._select(mailbox_name)
+
+				batch_size = min(max(1, int(batch_size)), 100)
+				ids = [int(uid) for uid in ids]
+
+				fetch_parts = FULL_FETCH_PARTS if fetch_attachments else parts
+				chunks_per_message = max(1, fetch_parts.count('['))
+
+				for i in range(0, len(ids), batch_size):
+					batch = ids[i:i + batch_size]
+
+					raws = {}
+					missing = []
+					for uid in batch:
+						raw = self._cache_get(mailbox_name, uid)
+						if raw is None:
+							missing.append(uid)
+						else:
+							raws[uid] = raw
+
+					if missing:
+						uidset = ','.join(str(uid) for uid in missing)
+						rv, list_data = self.uid('FETCH', uidset, fetch_parts)
+						if rv == 'OK':
+							for uid, raw in _join_raw_messages(list_data, chunks_per_message):
+								if uid is None:
+									yield Message(raw, mailbox=mailbox_name)
+								else:
+									self._cache_put(mailbox_name, uid, raw)
+									raws[uid] = raw
+
+					for uid in batch:
+						if uid in raws:
+							yield Message(raws[uid], mailbox=mailbox_name)
+
+			else:
+				raise ValueError(
+	f'{self.__class__.__name__}.fetch_bulk method takes a string mailbox name, that exists in list from {self.__class__.__name__}.get_mailboxes() method'
+				)
+
+		except imaplib.IMAP4.abort:
+			yield from self._reconnect().fetch_bulk(ids, mailbox_name, batch_size=batch_size, parts=parts, fetch_attachments=fetch_attachments)
+
+	def fetch_summaries(self, mailbox_name: str, ids: List[int] = None, batch_size: int = 100) -> Iterator['MessageSummary']:
+		try:
+			if self._has_mailbox(mailbox_name):
+				self._select(mailbox_name)
+
+				if ids is None:
+					ids = self.messages
+					if not isinstance(ids, list):
+						return
+
+				batch_size = min(max(1, int(batch_size)), 100)
+				ids = [int(uid) for uid in ids]
+
+				for i in range(0, len(ids), batch_size):
+					uidset = ','.join(str(uid) for uid in ids[i:i + batch_size])
+					rv, list_data = self.uid('FETCH', uidset, SUMMARY_FETCH_PARTS)
+					if rv == 'OK':
+						for flat, literals in _iter_fetch_entries(list_data):
+							fields = _fetch_fields(flat, literals)
+							yield MessageSummary(
+								self, mailbox_name,
+								uid=fields.get(b'UID'),
+								envelope=fields.get(b'ENVELOPE'),
+								size=fields.get(b'RFC822.SIZE'),
+								internal_date=fields.get(b'INTERNALDATE'),
+							)
+
+			else:
+				raise ValueError(
+	f'{self.__class__.__name__}.fetch_summaries method takes a string mailbox name, that exists in list from {self.__class__.__name__}.get_mailboxes() method'
+				)
+
+		except imaplib.IMAP4.abort:
+			yield from self._reconnect().fetch_summaries(mailbox_name, ids=ids, batch_size=batch_size)
+
+	def parallel_fetch(self, ids: List[int], mailbox_name: str = None, workers: int = 4, batch_size: int = 100,
+					   parts: str = DEFAULT_FETCH_PARTS, fetch_attachments: bool = False) -> List['Message']:
+		mailbox_name = str(mailbox_name) if mailbox_name else self.default_box
+		ids = [int(msg_id) for msg_id in ids]
+
+		if not ids:
+			return []
+
+		workers = min(max(1, int(workers)), len(ids))
+		chunk_size = -(-len(ids) // workers)
+		chunks = [ ids[i:i + chunk_size] for i in range(0, len(ids), chunk_size) ]
+		pool = [ self.copy() for _ in chunks ]
+
+		def fetch_chunk(mailer, chunk):
+			return list(mailer.fetch_bulk(chunk, mailbox_name, batch_size=batch_size, parts=parts, fetch_attachments=fetch_attachments))
 
-	def get_message(self, msg_id: int, mailbox_name: str) -> Union['Message', str]:
 		try:
-			if mailbox_name in self.mailboxes:
-				self.select(mailbox_name)
+			with ThreadPoolExecutor(max_workers=len(pool)) as executor:
+				return [ msg for batch in executor.map(fetch_chunk, pool, chunks) for msg in batch ]
+		finally:
+			for mailer in pool:
+				try:
+					mailer.logout()
+				except (OSError, imaplib.IMAP4.error):
+					pass
+
+	def get_message(self, msg_id: int, mailbox_name: str,
+					parts: str = DEFAULT_FETCH_PARTS, fetch_attachments: bool = False) -> Union['Message', str]:
+		try:
+			if self._has_mailbox(mailbox_name):
+				total = self._select(mailbox_name)
 
 				if msg_id <= 0:
-					msg_id += len(self.messages)
+					msg_id += total
+
+				uids = self.messages
+				if not isinstance(uids, list):
+					return uids
 
-				rv, data = self.fetch(str(msg_id), '(RFC822)')
+				if not 1 <= msg_id <= len(uids):
+					raise IndexError(
+	f'{self.__class__.__name__}.get_message index is out of range for mailbox {mailbox_name} with {len(uids)} messages'
+					)
+				uid = uids[msg_id - 1]
+
+				raw = self._cache_get(mailbox_name, uid)
+				if raw is not None:
+					return Message(raw, mailbox=mailbox_name)
+
+				fetch_parts = FULL_FETCH_PARTS if fetch_attachments else parts
+				rv, data = self.uid('FETCH', str(uid), fetch_parts)
 				if rv == 'OK':
-					return Message(data[0][1], mailbox=mailbox_name)
+					_, raw = _join_raw_messages(data, max(1, fetch_parts.count('[')))[0]
+					self._cache_put(mailbox_name, uid, raw)
+					return Message(raw, mailbox=mailbox_name)
 
-				self.select(self.default_box)
 				return rv
 
 			else:
 				raise ValueError(
-	f'{method_name} requires a string mailbox name as a key or an integer message index in {self.default_box}, that exists in list from {self.__class__.__name__}.get_mailboxes() method'
+	f'{self.__class__.__name__}.get_message requires a string mailbox name as a key or an integer message index in {self.default_box}, that exists in list from {self.__class__.__name__}.get_mailboxes() method'
 				)
 
 		except imaplib.IMAP4.abort:
-			return self.copy().get_message(msg_id, mailbox_name)
+			return self._reconnect().get_message(msg_id, mailbox_name, parts=parts, fetch_attachments=fetch_attachments)
 
-	def slice_messages(self, start: int, end: int, mailbox_name: str, step: int = 1) -> Union[List['Message'], str]:
+	def iter_slice(self, start: int, end: int, mailbox_name: str, step: int = 1, batch_size: int = 100,
+				   parts: str = DEFAULT_FETCH_PARTS, fetch_attachments: bool = False) -> Iterator['Message']:
 		try:
-			if mailbox_name in self.mailboxes:
-				self.select(mailbox_name)
+			if self._has_mailbox(mailbox_name):
+				total = self._select(mailbox_name)
 
 				if start <= 0:
-					start += len(self.messages)
+					start += total
 				if end <= 0:
-					end += len(self.messages)
+					end += total
 
 				start = max(1, start)
-				end = min(len(self.messages), end)
-
-				rv, list_data = self.fetch(f'{start}:{end}', '(RFC822)')
-				if rv == 'OK':
-					return [
-						Message(data[1], mailbox=mailbox_name) for i, data in enumerate(list_data) if isinstance(data, tuple) and isinstance(data[1], bytes) and i % step == 0
-					]
+				end = min(total, end)
 
-				self.select(self.default_box)
-				return rv
+				uids = self.messages
+				if isinstance(uids, list):
+					yield from self.fetch_bulk(uids[start - 1:end:step], mailbox_name, batch_size=batch_size, parts=parts, fetch_attachments=fetch_attachments)
 
 			else:
 				raise ValueError(
-	f'{method_name} requires a string mailbox name as a key or an integer message index in {self.default_box}, that exists in list from {self.__class__.__name__}.get_mailboxes() method'
+	f'{self.__class__.__name__}.iter_slice requires a string mailbox name as a key or an integer message index in {self.default_box}, that exists in list from {self.__class__.__name__}.get_mailboxes() method'
 				)
 
 		except imaplib.IMAP4.abort:
-			return self.copy().slice_messages(start, end, mailbox_name, step=step)
+			yield from self._reconnect().iter_slice(start, end, mailbox_name, step=step, batch_size=batch_size, parts=parts, fetch_attachments=fetch_attachments)
+
+	def slice_messages(self, start: int, end: int, mailbox_name: str, step: int = 1,
+					   parts: str = DEFAULT_FETCH_PARTS, fetch_attachments: bool = False) -> List['Message']:
+		return list(self.iter_slice(start, end, mailbox_name, step=step, parts=parts, fetch_attachments=fetch_attachments))
+
+	def iter_messages(self, mailbox_name: str, start: int = 1, end: int = 0, step: int = 1, batch_size: int = 20,
+					  parts: str = DEFAULT_FETCH_PARTS, fetch_attachments: bool = False) -> Iterator['Message']:
+		yield from self.iter_slice(start, end, mailbox_name, step=step, batch_size=batch_size, parts=parts, fetch_attachments=fetch_attachments)
 
 	def __getitem__(self, mailbox: Union[str, int]) -> Union['MailBox', 'Message']:
 		err_text = '{}.__geitem__ requires a string mailbox name as a key or an integer message index in {}, that exists in list from {}.get_mailboxes() method'.format(
@@ -264,7 +918,7 @@ f'{self.__class__.__name__}.messages method takes a string mailbox name, that ex
 			if mailbox.lower() == 'inbox':
 				mailbox = 'INBOX'
 
-			if mailbox in self.mailboxes:
+			if self._has_mailbox(mailbox):
 				return MailBox(self, mailbox)
 			else:
 				raise KeyError(err_text)
@@ -279,12 +933,99 @@ f'{self.__class__.__name__}.messages method takes a string mailbox name, that ex
 			raise ValueError(err_text)
 
 	def serialize(self) -> List[dict]:
-		return [ msg.serialize() for msg in self.messages ]
+		return [ msg.serialize() for msg in self.fetch_bulk(self.messages, self.default_box) ]
 	def json(self, indent: int = None) -> str:
-		return json.dumps(self.serialize()) if not indent else json.dumps(self.serialize(), indent=indent)
+		return _dump_json_bytes(self.serialize(), indent=indent).decode()
+	def jsonb(self, indent: int = None) -> bytes:
+		return _dump_json_bytes(self.serialize(), indent=indent)
 
 	def copy(self) -> 'MailBox':
-		return self.__class__(self.username, self.password, self.host, port=self.port, default_box=self.default_box)
+		return self.__class__(self.username, self.password, self.host, port=self.port, default_box=self.default_box, cache_path=self.cache_path)
+
+	def __str__(self):
+		return f'{self.__class__.__name__}(client "{self.username}", {self.host}:{self.port})'
+
+
+class AsyncMailer:
+	def __init__(self, username: str, password: str, host: str, port: int = 993, default_box: str = 'INBOX'):
+		if aioimaplib is None:
+			raise ImportError(f'{self.__class__.__name__} requires the aioimaplib package: pip install aioimaplib')
+
+		self.username = str(username)
+		self.password = str(password)
+		self.default_box = str(default_box)
+		self.host = str(host)
+		self.port = int(port)
+
+		self.imap = None
+
+	async def connect(self) -> 'AsyncMailer':
+		self.imap = aioimaplib.IMAP4_SSL(self.host, self.port)
+		await self.imap.wait_hello_from_server()
+		await self.imap.login(self.username, self.password)
+		await self.imap.select(self.default_box)
+		return self
+
+	async def logout(self):
+		if self.imap is not None:
+			await self.imap.logout()
+			self.imap = None
+
+	async def _select(self, mailbox_name: str) -> int:
+		response = await self.imap.select(mailbox_name)
+
+		for line in response.lines:
+			if line.endswith(b'EXISTS'):
+				return int(line.split()[0])
+
+		return 0
+
+	def _raw_from_lines(self, lines: list) -> Optional[bytes]:
+		for line in lines:
+			if isinstance(line, bytearray):
+				return bytes(line)
+
+	async def get_message(self, msg_id: int, mailbox_name: str = None) -> Optional['Message']:
+		mailbox_name = str(mailbox_name) if mailbox_name else self.default_box
+		total = await self._select(mailbox_name)
+
+		if msg_id <= 0:
+			msg_id += total
+
+		response = await self.imap.fetch(str(msg_id), FULL_FETCH_PARTS)
+		if response.result == 'OK':
+			raw = self._raw_from_lines(response.lines)
+			if raw is not None:
+				return Message(raw, mailbox=mailbox_name)
+
+	async def gather_messages(self, ids: List[int], mailbox_name: str = None) -> List['Message']:
+		mailbox_name = str(mailbox_name) if mailbox_name else self.default_box
+		await self._select(mailbox_name)
+
+		responses = await asyncio.gather(*[ self.imap.fetch(str(int(msg_id)), FULL_FETCH_PARTS) for msg_id in ids ])
+
+		messages = []
+		for response in responses:
+			if response.result == 'OK':
+				raw = self._raw_from_lines(response.lines)
+				if raw is not None:
+					messages.append(Message(raw, mailbox=mailbox_name))
+
+		return messages
+
+	async def slice_messages(self, start: int, end: int, mailbox_name: str = None, step: int = 1) -> List['Message']:
+		mailbox_name = str(mailbox_name) if mailbox_name else self.default_box
+		total = await self._select(mailbox_name)
+
+		if start <= 0:
+			start += total
+		if end <= 0:
+			end += total
+
+		start = max(1, start)
+		end = min(total, end)
+
+		return await self.gather_messages(range(start, end + 1, step), mailbox_name)
 
 	def __str__(self):
 		return f'{self.__class__.__name__}(client "{self.username}", {self.host}:{self.port})'
\ No newline at end of file